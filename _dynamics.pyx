@@ -0,0 +1,121 @@
+# cython: language_level=3
+"""
+Optional C implementation of the RK4 step (see dynamics.rk4_step).
+Build in place with: python setup.py build_ext --inplace
+"""
+cimport cython
+from libc.math cimport sin, fmod, M_PI
+
+cdef extern from *:
+    """
+    #include <math.h>
+    #if defined(__GLIBC__)
+    #define cp_sincos(x, s, c) sincos((x), (s), (c))
+    #elif defined(__APPLE__)
+    #define cp_sincos(x, s, c) __sincos((x), (s), (c))
+    #else
+    static inline void cp_sincos(double x, double* s, double* c) { *s = sin(x); *c = cos(x); }
+    #endif
+    """
+    # One range reduction for both values where libm provides sincos
+    void cp_sincos(double x, double* s, double* c) nogil
+
+
+@cython.cdivision(True)
+cdef inline void dynamics_free_c(
+    double x_dot, double theta, double theta_dot,
+    double force, double cart_damp, double pole_damp,
+    double M, double m, double l, double g,
+    double* d,
+) noexcept nogil:
+    cdef double force_eff = force - cart_damp * x_dot
+    cdef double s, c
+    cp_sincos(theta, &s, &c)
+
+    cdef double theta_dd_extra = -pole_damp * theta_dot / (m * l * l + 1e-9)
+
+    cdef double temp = (force_eff + m * l * theta_dot * theta_dot * s) / (M + m)
+    cdef double denom = l * (4.0 / 3.0 - (m * c * c) / (M + m))
+    cdef double theta_dd = (g * s - c * temp) / (denom + 1e-9)
+    cdef double x_dd = temp - (m * l * theta_dd * c) / (M + m)
+
+    d[0] = x_dot
+    d[1] = x_dd
+    d[2] = theta_dot
+    d[3] = theta_dd + theta_dd_extra
+
+
+@cython.cdivision(True)
+cdef inline void pendulum_c(
+    double theta, double theta_dot, double pole_damp,
+    double m, double l, double g,
+    double* d,
+) noexcept nogil:
+    # Cart held at wall: only the fixed-pivot rod moves
+    cdef double theta_dd_extra = -pole_damp * theta_dot / (m * l * l + 1e-9)
+
+    d[0] = theta_dot
+    d[1] = (g * sin(theta)) / (l * (4.0 / 3.0) + 1e-9) + theta_dd_extra
+
+
+@cython.cdivision(True)
+cdef inline double wrap_angle_c(double theta) noexcept nogil:
+    # Same result as Python's (theta + pi) % (2 pi) - pi, including for negatives
+    cdef double r = fmod(theta + M_PI, 2.0 * M_PI)
+    if r < 0.0:
+        r += 2.0 * M_PI
+    return r - M_PI
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cpdef void rk4_step_c(
+    double[::1] state_inout,
+    double force,
+    double dt,
+    bint constrained,
+    double cart_damp,
+    double pole_damp,
+    double M,
+    double m,
+    double l,
+    double g,
+) noexcept:
+    """Advance a length-4 state by one RK4 step, writing the result in place."""
+    cdef double s0[4]
+    cdef double st[4]
+    cdef double k1[4]
+    cdef double k2[4]
+    cdef double k3[4]
+    cdef double k4[4]
+    cdef int i
+
+    for i in range(4):
+        s0[i] = state_inout[i]
+
+    if constrained:
+        # x_dot and x_dd are identically zero, so only (theta, theta_dot) is integrated
+        pendulum_c(s0[2], s0[3], pole_damp, m, l, g, k1)
+        pendulum_c(s0[2] + 0.5 * dt * k1[0], s0[3] + 0.5 * dt * k1[1], pole_damp, m, l, g, k2)
+        pendulum_c(s0[2] + 0.5 * dt * k2[0], s0[3] + 0.5 * dt * k2[1], pole_damp, m, l, g, k3)
+        pendulum_c(s0[2] + dt * k3[0], s0[3] + dt * k3[1], pole_damp, m, l, g, k4)
+        for i in range(2):
+            state_inout[2 + i] = s0[2 + i] + (dt / 6.0) * (k1[i] + k4[i] + 2.0 * (k2[i] + k3[i]))
+        state_inout[2] = wrap_angle_c(state_inout[2])
+        return
+
+    dynamics_free_c(s0[1], s0[2], s0[3], force, cart_damp, pole_damp, M, m, l, g, k1)
+    for i in range(4):
+        st[i] = s0[i] + 0.5 * dt * k1[i]
+    dynamics_free_c(st[1], st[2], st[3], force, cart_damp, pole_damp, M, m, l, g, k2)
+    for i in range(4):
+        st[i] = s0[i] + 0.5 * dt * k2[i]
+    dynamics_free_c(st[1], st[2], st[3], force, cart_damp, pole_damp, M, m, l, g, k3)
+    for i in range(4):
+        st[i] = s0[i] + dt * k3[i]
+    dynamics_free_c(st[1], st[2], st[3], force, cart_damp, pole_damp, M, m, l, g, k4)
+
+    for i in range(4):
+        state_inout[i] = s0[i] + (dt / 6.0) * (k1[i] + k4[i] + 2.0 * (k2[i] + k3[i]))
+    state_inout[2] = wrap_angle_c(state_inout[2])
@@ -20,6 +20,7 @@ class Controller:
     def __call__(self, state: np.ndarray, t: float, ref_x: float, ref_theta: float) -> float:
         """
         Compute the control input given the current state and references.
+        `state` is a buffer reused every step: read it, but don't modify it or keep a reference to it.
         """
         
         x = state[0]
@@ -1,60 +1,248 @@
-import math
-
 import numpy as np
 
+from dynamics_numba import (
+    _derived,
+    _dyn_con,
+    _dyn_free,
+    _rk4_step_njit,
+    _semi_implicit_step_njit,
+)
 from params import P
-from utils import wrap_angle
-
 
-def dynamics_free(state: np.ndarray, force: float, cart_damp: float, pole_damp: float) -> np.ndarray:
-    x, x_dot, theta, theta_dot = state
+try:
+    # Optional C extension, built with `python setup.py build_ext --inplace`
+    from _dynamics import rk4_step_c
+except ImportError:
+    rk4_step_c = None
 
-    force_eff = force - cart_damp * x_dot
 
-    s = math.sin(theta)
-    c = math.cos(theta)
+# Physical constants are snapshotted at import so the hot path never touches
+# the P namespace; edit params.py (not P at runtime) to change them.
+_M, _m, _l, _g = P.M, P.m, P.l, P.g
 
-    tau_damp = -pole_damp * theta_dot
-    theta_dd_extra = tau_damp / (P.m * (P.l**2) + 1e-9)
 
-    temp = (force_eff + P.m * P.l * (theta_dot ** 2) * s) / (P.M + P.m)
-    denom = P.l * (4.0 / 3.0 - (P.m * (c ** 2)) / (P.M + P.m))
-    theta_dd = (P.g * s - c * temp) / (denom + 1e-9)
-    x_dd = temp - (P.m * P.l * theta_dd * c) / (P.M + P.m)
-
-    theta_dd += theta_dd_extra
-
-    return np.array([x_dot, x_dd, theta_dot, theta_dd], dtype=float)
-
-
-def dynamics_constrained(state: np.ndarray, pole_damp: float) -> np.ndarray:
-    # Cart held at wall: x_dot = 0, x_dd = 0; pole is a fixed-pivot rod
+def dynamics_free(
+    state: np.ndarray,
+    force: float,
+    cart_damp: float,
+    pole_damp: float,
+    M: float = _M,
+    m: float = _m,
+    l: float = _l,
+    g: float = _g,
+) -> tuple[float, float, float, float]:
     x, x_dot, theta, theta_dot = state
+    return _dyn_free(float(x), float(x_dot), float(theta), float(theta_dot),
+                     force, cart_damp, pole_damp, *_derived(M, m, l, g))
+
+
+def dynamics_constrained(
+    state: np.ndarray,
+    pole_damp: float,
+    M: float = _M,
+    m: float = _m,
+    l: float = _l,
+    g: float = _g,
+) -> tuple[float, float, float, float]:
+    x, x_dot, theta, theta_dot = state
+    return _dyn_con(float(x), float(x_dot), float(theta), float(theta_dot),
+                    0.0, 0.0, pole_damp, *_derived(M, m, l, g))
+
+
+def rk4_step(
+    state: np.ndarray,
+    force: float,
+    dt: float,
+    constrained: bool,
+    cart_damp: float,
+    pole_damp: float,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Advance the state by one RK4 step.
+    If `out` is given (it may be `state` itself), the result is written into it
+    instead of allocating a new array.
+    """
+    if out is None:
+        out = np.empty(4)
+
+    # The C kernel takes a contiguous float64 buffer; anything else goes through Numba
+    if rk4_step_c is not None and out.dtype == np.float64 and out.flags.c_contiguous:
+        if out is not state:
+            out[:] = state
+        rk4_step_c(out, force, dt, constrained, cart_damp, pole_damp, _M, _m, _l, _g)
+        return out
+
+    _rk4_step_njit(state, out, float(force), float(dt), bool(constrained),
+                   float(cart_damp), float(pole_damp), _M, _m, _l, _g)
+    return out
+
+
+def semi_implicit_step(
+    state: np.ndarray,
+    force: float,
+    dt: float,
+    constrained: bool,
+    cart_damp: float,
+    pole_damp: float,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Advance the state by one semi-implicit (symplectic) Euler step.
+    About 4x cheaper than rk4_step and stable at the sim's dt, but only first-order
+    accurate; prefer rk4_step wherever predictions need to be precise.
+    """
+    if out is None:
+        out = np.empty(4)
+    _semi_implicit_step_njit(state, out, float(force), float(dt), bool(constrained),
+                             float(cart_damp), float(pole_damp), _M, _m, _l, _g)
+    return out
+
+
+_DERIVED = _derived(_M, _m, _l, _g)
+
+
+def dynamics_free_batch(
+    states: np.ndarray,
+    forces: np.ndarray,
+    cart_damp: float,
+    pole_damp: float,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Vectorized dynamics_free for a batch of states of shape (N, 4).
+    forces (and optionally the damping terms) broadcast against N.
+    """
+    x_dot = states[:, 1]
+    theta = states[:, 2]
+    theta_dot = states[:, 3]
+
+    g, ml, inv_Mm, l43, inv_ml2 = _DERIVED
+
+    force_eff = forces - cart_damp * x_dot
+
+    s = np.sin(theta)
+    c = np.cos(theta)
+
+    theta_dd_extra = -pole_damp * theta_dot * inv_ml2
+
+    temp = (force_eff + ml * (theta_dot ** 2) * s) * inv_Mm
+    denom = l43 - ml * (c ** 2) * inv_Mm
+    theta_dd = (g * s - c * temp) / (denom + 1e-9)
+    x_dd = temp - ml * theta_dd * c * inv_Mm
 
-    s = math.sin(theta)
-
-    tau_damp = -pole_damp * theta_dot
-    theta_dd_extra = tau_damp / (P.m * (P.l**2) + 1e-9)
-
-    denom_fixed = P.l * (4.0 / 3.0)
-    theta_dd = (P.g * s) / (denom_fixed + 1e-9) + theta_dd_extra
-
-    return np.array([0.0, 0.0, theta_dot, theta_dd], dtype=float)
-
-
-def rk4_step(state: np.ndarray, force: float, dt: float, constrained: bool, cart_damp: float, pole_damp: float) -> np.ndarray:
-    if constrained:
-        f = lambda st: dynamics_constrained(st, pole_damp)
-    else:
-        f = lambda st: dynamics_free(st, force, cart_damp, pole_damp)
-
-    k1 = f(state)
-    k2 = f(state + 0.5 * dt * k1)
-    k3 = f(state + 0.5 * dt * k2)
-    k4 = f(state + dt * k3)
-
-    nxt = state + (dt / 6.0) * (k1 + 2 * k2 + 2 * k3 + k4)
-    nxt[2] = wrap_angle(float(nxt[2]))
-    return nxt
-
+    theta_dd += theta_dd_extra
 
+    if out is None:
+        out = np.empty_like(states)
+    out[:, 0] = x_dot
+    out[:, 1] = x_dd
+    out[:, 2] = theta_dot
+    out[:, 3] = theta_dd
+    return out
+
+
+def dynamics_constrained_batch(states: np.ndarray, pole_damp: float, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Vectorized dynamics_constrained for a batch of states of shape (N, 4).
+    """
+    g, _, _, l43, inv_ml2 = _DERIVED
+    theta = states[:, 2]
+    theta_dot = states[:, 3]
+
+    theta_dd_extra = -pole_damp * theta_dot * inv_ml2
+    theta_dd = (g * np.sin(theta)) / (l43 + 1e-9) + theta_dd_extra
+
+    if out is None:
+        out = np.empty_like(states)
+    out[:, 0] = 0.0
+    out[:, 1] = 0.0
+    out[:, 2] = theta_dot
+    out[:, 3] = theta_dd
+    return out
+
+
+class BatchIntegrator:
+    """
+    RK4 integrator for N independent cart-poles advanced in lockstep.
+    Owns the (N, 4) stage buffers so repeated steps do not allocate.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.k1 = np.empty((n, 4))
+        self.k2 = np.empty((n, 4))
+        self.k3 = np.empty((n, 4))
+        self.k4 = np.empty((n, 4))
+        self._stage = np.empty((n, 4))
+        self._con = np.empty((n, 4))
+
+    def _derivs(self, states, forces, constrained, cart_damp, pole_damp, out):
+        dynamics_free_batch(states, forces, cart_damp, pole_damp, out=out)
+        if constrained is not None:
+            dynamics_constrained_batch(states, pole_damp, out=self._con)
+            np.copyto(out, self._con, where=constrained[:, None])
+        return out
+
+    def step(
+        self,
+        states: np.ndarray,
+        forces: np.ndarray,
+        dt: float,
+        cart_damp: float,
+        pole_damp: float,
+        constrained: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        Advance `states` (N, 4) by one RK4 step in place and return it.
+        `constrained` is an optional (N,) bool mask of carts held at a wall.
+        """
+        k1, k2, k3, k4, stage = self.k1, self.k2, self.k3, self.k4, self._stage
+
+        self._derivs(states, forces, constrained, cart_damp, pole_damp, k1)
+        np.multiply(k1, 0.5 * dt, out=stage)
+        stage += states
+        self._derivs(stage, forces, constrained, cart_damp, pole_damp, k2)
+        np.multiply(k2, 0.5 * dt, out=stage)
+        stage += states
+        self._derivs(stage, forces, constrained, cart_damp, pole_damp, k3)
+        np.multiply(k3, dt, out=stage)
+        stage += states
+        self._derivs(stage, forces, constrained, cart_damp, pole_damp, k4)
+
+        # states += dt/6 * (k1 + k4 + 2*(k2 + k3))
+        k2 += k3
+        k2 *= 2.0
+        k2 += k1
+        k2 += k4
+        k2 *= dt / 6.0
+        states += k2
+
+        theta = states[:, 2]
+        theta += np.pi
+        np.mod(theta, 2 * np.pi, out=theta)
+        theta -= np.pi
+        return states
+
+
+def rk4_step_batch(
+    states: np.ndarray,
+    forces: np.ndarray,
+    dt: float,
+    cart_damp: float,
+    pole_damp: float,
+    constrained: np.ndarray | None = None,
+) -> np.ndarray:
+    """
+    Return `states` (N, 4) advanced by one RK4 step.
+    For repeated stepping, hold a BatchIntegrator to reuse its buffers.
+    """
+    nxt = np.array(states, dtype=float)
+    return BatchIntegrator(len(nxt)).step(nxt, forces, dt, cart_damp, pole_damp, constrained)
+
+
+# Compile the kernels now rather than on the first simulation step
+rk4_step(np.zeros(4), 0.0, P.dt, False, 0.0, 0.0)
+rk4_step(np.zeros(4), 0.0, P.dt, True, 0.0, 0.0)
+semi_implicit_step(np.zeros(4), 0.0, P.dt, False, 0.0, 0.0)
+semi_implicit_step(np.zeros(4), 0.0, P.dt, True, 0.0, 0.0)
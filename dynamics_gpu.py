@@ -0,0 +1,149 @@
+"""
+Batched cart-pole dynamics for PyTorch (CUDA) and JAX.
+
+Both backends share the same right-hand side (`_rhs`), written against a
+generic array module so it works on torch tensors and jax arrays alike.
+Only the free (unconstrained) cart is modelled; wall handling is left to the
+caller. Neither torch nor jax is required by the rest of the playground.
+"""
+import math
+
+from params import P, Params
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+try:
+    import jax
+    import jax.numpy as jnp
+except ImportError:
+    jax = None
+    jnp = None
+
+
+def _rhs(xp, x_dot, theta, theta_dot, force, cart_damp, pole_damp, M, m, l, g):
+    """Same equations as dynamics.dynamics_free, on arrays from module `xp`."""
+    force_eff = force - cart_damp * x_dot
+
+    s = xp.sin(theta)
+    c = xp.cos(theta)
+
+    tau_damp = -pole_damp * theta_dot
+    theta_dd_extra = tau_damp / (m * (l**2) + 1e-9)
+
+    temp = (force_eff + m * l * (theta_dot ** 2) * s) / (M + m)
+    denom = l * (4.0 / 3.0 - (m * (c ** 2)) / (M + m))
+    theta_dd = (g * s - c * temp) / (denom + 1e-9)
+    x_dd = temp - (m * l * theta_dd * c) / (M + m)
+
+    return x_dot, x_dd, theta_dot, theta_dd + theta_dd_extra
+
+
+def _wrap(xp, theta):
+    return xp.remainder(theta + math.pi, 2 * math.pi) - math.pi
+
+
+# -----------------------------
+# PyTorch
+# -----------------------------
+def dynamics_free_t(state, force, cart_damp: float, pole_damp: float, params: Params = P, out=None):
+    """State derivative for a (N, 4) tensor; force is (N,)."""
+    derivs = _rhs(
+        torch, state[:, 1], state[:, 2], state[:, 3], force, cart_damp, pole_damp,
+        params.M, params.m, params.l, params.g,
+    )
+    return torch.stack(derivs, dim=1, out=out)
+
+
+def rk4_step_t(state, force, dt: float, cart_damp: float, pole_damp: float, params: Params = P):
+    """Return `state` (N, 4) advanced by one RK4 step."""
+    k1 = dynamics_free_t(state, force, cart_damp, pole_damp, params)
+    k2 = dynamics_free_t(state + 0.5 * dt * k1, force, cart_damp, pole_damp, params)
+    k3 = dynamics_free_t(state + 0.5 * dt * k2, force, cart_damp, pole_damp, params)
+    k4 = dynamics_free_t(state + dt * k3, force, cart_damp, pole_damp, params)
+
+    nxt = state + (dt / 6.0) * (k1 + k4 + 2.0 * (k2 + k3))
+    nxt[:, 2] = _wrap(torch, nxt[:, 2])
+    return nxt
+
+
+class BatchedSim:
+    """
+    N cart-poles advanced in lockstep on a torch device.
+    `state` and `force` are preallocated; write forces in place, then call step().
+    """
+
+    def __init__(self, n: int, device: str = "cuda", dtype=None, params: Params = P):
+        if torch is None:
+            raise ImportError("BatchedSim requires PyTorch (pip install torch)")
+
+        self.n = n
+        self.params = params
+        self.device = torch.device(device)
+        dtype = dtype or torch.float32
+
+        self.state = torch.zeros((n, 4), device=self.device, dtype=dtype)
+        self.force = torch.zeros(n, device=self.device, dtype=dtype)
+        self.k1 = torch.empty_like(self.state)
+        self.k2 = torch.empty_like(self.state)
+        self.k3 = torch.empty_like(self.state)
+        self.k4 = torch.empty_like(self.state)
+        self._stage = torch.empty_like(self.state)
+
+    def reset(self, state=None) -> None:
+        if state is None:
+            self.state.zero_()
+        else:
+            self.state.copy_(torch.as_tensor(state))
+        self.force.zero_()
+
+    def step(self, dt: float = P.dt, cart_damp: float = P.cart_damping, pole_damp: float = P.pole_damping):
+        """Advance `state` by one RK4 step in place and return it."""
+        st, f, stage, pr = self.state, self.force, self._stage, self.params
+        k1, k2, k3, k4 = self.k1, self.k2, self.k3, self.k4
+
+        with torch.no_grad():
+            dynamics_free_t(st, f, cart_damp, pole_damp, pr, out=k1)
+            torch.add(st, k1, alpha=0.5 * dt, out=stage)
+            dynamics_free_t(stage, f, cart_damp, pole_damp, pr, out=k2)
+            torch.add(st, k2, alpha=0.5 * dt, out=stage)
+            dynamics_free_t(stage, f, cart_damp, pole_damp, pr, out=k3)
+            torch.add(st, k3, alpha=dt, out=stage)
+            dynamics_free_t(stage, f, cart_damp, pole_damp, pr, out=k4)
+
+            k2.add_(k3).mul_(2.0).add_(k1).add_(k4)
+            st.add_(k2, alpha=dt / 6.0)
+
+            theta = st[:, 2]
+            theta.copy_(_wrap(torch, theta))
+        return st
+
+
+# -----------------------------
+# JAX
+# -----------------------------
+def rk4_step_single(state, force, dt: float, cart_damp: float, pole_damp: float, params: Params = P):
+    """RK4 step for a single (4,) state; vmap over it for batches."""
+
+    def f(st):
+        return jnp.stack(_rhs(
+            jnp, st[1], st[2], st[3], force, cart_damp, pole_damp,
+            params.M, params.m, params.l, params.g,
+        ))
+
+    k1 = f(state)
+    k2 = f(state + 0.5 * dt * k1)
+    k3 = f(state + 0.5 * dt * k2)
+    k4 = f(state + dt * k3)
+
+    nxt = state + (dt / 6.0) * (k1 + k4 + 2.0 * (k2 + k3))
+    return nxt.at[2].set(_wrap(jnp, nxt[2]))
+
+
+if jax is not None:
+    # (N, 4) states, (N,) forces; dt and damping are shared across the batch
+    rk4_step_jax = jax.jit(jax.vmap(rk4_step_single, in_axes=(0, 0, None, None, None)))
+else:
+    rk4_step_jax = None
@@ -0,0 +1,174 @@
+"""
+Numba-compiled cart-pole kernels.
+
+Everything here works on scalar locals (no per-stage arrays) and takes the
+physical constants as arguments, so it can be called from other @njit code.
+dynamics.py wraps these for Python callers; step_n fuses the main loop's
+whole substep block (constraints, integration, safety clamps) into one call.
+"""
+import math
+
+import numpy as np
+from numba import njit
+
+from params import P
+from utils_fast import wrap_angle
+
+
+@njit(cache=True, fastmath=True)
+def _derived(M, m, l, g):
+    """Per-stage invariants: (g, ml, 1/(M+m), 4l/3, 1/(m l^2))."""
+    return g, m * l, 1.0 / (M + m), l * (4.0 / 3.0), 1.0 / (m * (l**2) + 1e-9)
+
+
+@njit(cache=True, fastmath=True)
+def _dyn_free(x, xd, th, thd, force, cart_damp, pole_damp, g, ml, inv_Mm, l43, inv_ml2):
+    force_eff = force - cart_damp * xd
+
+    s = math.sin(th)
+    c = math.cos(th)
+
+    theta_dd_extra = -pole_damp * thd * inv_ml2
+
+    temp = (force_eff + ml * (thd ** 2) * s) * inv_Mm
+    denom = l43 - ml * (c ** 2) * inv_Mm  # l * (4/3 - m c^2 / (M + m))
+    theta_dd = (g * s - c * temp) / (denom + 1e-9)
+    x_dd = temp - ml * theta_dd * c * inv_Mm
+
+    theta_dd += theta_dd_extra
+
+    return xd, x_dd, thd, theta_dd
+
+
+@njit(cache=True, fastmath=True)
+def _pendulum_rhs(th, thd, pole_damp, g, l43, inv_ml2):
+    # Fixed-pivot rod: the cart terms drop out entirely
+    return thd, (g * math.sin(th)) / (l43 + 1e-9) - pole_damp * thd * inv_ml2
+
+
+@njit(cache=True, fastmath=True)
+def _dyn_con(x, xd, th, thd, force, cart_damp, pole_damp, g, ml, inv_Mm, l43, inv_ml2):
+    # Cart held at wall: x_dot = 0, x_dd = 0; pole is a fixed-pivot rod
+    theta_d, theta_dd = _pendulum_rhs(th, thd, pole_damp, g, l43, inv_ml2)
+    return 0.0, 0.0, theta_d, theta_dd
+
+
+@njit(cache=True, fastmath=True)
+def _rk4_pendulum(th, thd, dt, pole_damp, g, l43, inv_ml2):
+    """RK4 on the 2-state pendulum (theta, theta_dot) used while the cart is held."""
+    h = 0.5 * dt
+
+    k1c, k1d = _pendulum_rhs(th, thd, pole_damp, g, l43, inv_ml2)
+    k2c, k2d = _pendulum_rhs(th + h * k1c, thd + h * k1d, pole_damp, g, l43, inv_ml2)
+    k3c, k3d = _pendulum_rhs(th + h * k2c, thd + h * k2d, pole_damp, g, l43, inv_ml2)
+    k4c, k4d = _pendulum_rhs(th + dt * k3c, thd + dt * k3d, pole_damp, g, l43, inv_ml2)
+
+    w = dt / 6.0
+    return th + w * (k1c + k4c + 2.0 * (k2c + k3c)), thd + w * (k1d + k4d + 2.0 * (k2d + k3d))
+
+
+@njit(cache=True, fastmath=True)
+def _rk4_step_njit(state, out, force, dt, constrained, cart_damp, pole_damp, M, m, l, g):
+    # Read everything into locals first so `out` may alias `state`
+    x, xd, th, thd = state[0], state[1], state[2], state[3]
+    h = 0.5 * dt
+    g, ml, inv_Mm, l43, inv_ml2 = _derived(M, m, l, g)
+
+    if constrained:
+        # x_dot and x_dd are identically zero, so only the pole needs integrating
+        th_new, thd_new = _rk4_pendulum(th, thd, dt, pole_damp, g, l43, inv_ml2)
+        out[0] = x
+        out[1] = xd
+        out[2] = wrap_angle(th_new)
+        out[3] = thd_new
+        return
+
+    k1a, k1b, k1c, k1d = _dyn_free(x, xd, th, thd, force, cart_damp, pole_damp,
+                                   g, ml, inv_Mm, l43, inv_ml2)
+    k2a, k2b, k2c, k2d = _dyn_free(x + h * k1a, xd + h * k1b, th + h * k1c, thd + h * k1d,
+                                   force, cart_damp, pole_damp, g, ml, inv_Mm, l43, inv_ml2)
+    k3a, k3b, k3c, k3d = _dyn_free(x + h * k2a, xd + h * k2b, th + h * k2c, thd + h * k2d,
+                                   force, cart_damp, pole_damp, g, ml, inv_Mm, l43, inv_ml2)
+    k4a, k4b, k4c, k4d = _dyn_free(x + dt * k3a, xd + dt * k3b, th + dt * k3c, thd + dt * k3d,
+                                   force, cart_damp, pole_damp, g, ml, inv_Mm, l43, inv_ml2)
+
+    w = dt / 6.0
+    out[0] = x + w * (k1a + k4a + 2.0 * (k2a + k3a))
+    out[1] = xd + w * (k1b + k4b + 2.0 * (k2b + k3b))
+    out[2] = wrap_angle(th + w * (k1c + k4c + 2.0 * (k2c + k3c)))
+    out[3] = thd + w * (k1d + k4d + 2.0 * (k2d + k3d))
+
+
+@njit(cache=True, fastmath=True)
+def _semi_implicit_step_njit(state, out, force, dt, constrained, cart_damp, pole_damp, M, m, l, g):
+    x, xd, th, thd = state[0], state[1], state[2], state[3]
+    g, ml, inv_Mm, l43, inv_ml2 = _derived(M, m, l, g)
+
+    # One right-hand-side evaluation; velocities first, then positions from the new velocities
+    if constrained:
+        # Cart held at the wall, as in _rk4_step_njit: only the pole moves
+        _, theta_dd = _pendulum_rhs(th, thd, pole_damp, g, l43, inv_ml2)
+        out[0] = x
+        out[1] = xd
+    else:
+        _, x_dd, _, theta_dd = _dyn_free(x, xd, th, thd, force, cart_damp, pole_damp,
+                                         g, ml, inv_Mm, l43, inv_ml2)
+        xd += dt * x_dd
+        out[0] = x + dt * xd
+        out[1] = xd
+
+    thd += dt * theta_dd
+    out[2] = wrap_angle(th + dt * thd)
+    out[3] = thd
+
+
+# Accepted values of P.integrator, as understood by step_n
+INTEGRATORS = ("rk4", "semi_implicit")
+
+
+@njit(cache=True, fastmath=True)
+def _constraint_flag(x, force_total, x_min, x_max):
+    eps = 1e-6
+    at_left = x <= x_min + eps
+    at_right = x >= x_max - eps
+    return (at_left and force_total < 0.0) or (at_right and force_total > 0.0)
+
+
+@njit(cache=True, fastmath=True)
+def step_n(state, f_total, dt, n, x_min, x_max, cart_damp, pole_damp, M, m, l, g, semi_implicit=False):
+    """
+    Advance `state` in place by `n` substeps of `dt` under a constant force,
+    handling the track-end constraint and safety clamps. Returns `state`.
+    """
+    for _ in range(n):
+        constrained = _constraint_flag(state[0], f_total, x_min, x_max)
+
+        if constrained:
+            if state[0] <= x_min:
+                state[0] = x_min
+            if state[0] >= x_max:
+                state[0] = x_max
+            state[1] = 0.0
+
+        if semi_implicit:
+            _semi_implicit_step_njit(state, state, f_total, dt, constrained, cart_damp, pole_damp, M, m, l, g)
+        else:
+            _rk4_step_njit(state, state, f_total, dt, constrained, cart_damp, pole_damp, M, m, l, g)
+
+        # Safety clamp
+        if state[0] < x_min:
+            state[0] = x_min
+            if state[1] < 0:
+                state[1] = 0.0
+        elif state[0] > x_max:
+            state[0] = x_max
+            if state[1] > 0:
+                state[1] = 0.0
+
+    return state
+
+
+def warmup_step_n():
+    """Compile (or load from cache) step_n for both integrators on dummy data."""
+    for semi in (False, True):
+        step_n(np.zeros(4), 0.0, P.dt, 1, -1.0, 1.0, 0.0, 0.0, P.M, P.m, P.l, P.g, semi)
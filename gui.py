@@ -5,6 +5,8 @@ import pygame
 from dataclasses import dataclass
 from typing import Callable
 
+_MOUSE_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+
 
 @dataclass
 class SliderConfig:
@@ -46,6 +48,7 @@ class ParameterPanel:
         self.label_width = 28
         self.input_width = 55
         self.input_height = 18
+        self.shadow_offset = 3
 
         # Computed height
         self.height = self.title_height + self.padding + len(sliders) * self.slider_spacing + self.padding - 4
@@ -56,6 +59,17 @@ class ParameterPanel:
         self.label_font = None
         self.value_font = None
         self.input_font = None
+        self._label_imgs: list[pygame.Surface] = []
+
+        # Pre-drawn panel chrome, track and handle graphics (built on first draw)
+        self._chrome_surf: pygame.Surface | None = None
+        self._track_bg_surf: pygame.Surface | None = None
+        self._track_border_surf: pygame.Surface | None = None
+        self._handle_imgs: list[tuple[pygame.Surface, pygame.Surface, pygame.Surface]] = []
+
+        # Rendered value strings, keyed by (slider index, text)
+        self.value_cache_per_slider = 32
+        self._value_cache: dict[tuple[int, str], pygame.Surface] = {}
 
         # Drag state
         self.dragging_index: int | None = None
@@ -63,7 +77,15 @@ class ParameterPanel:
         # Text input state
         self.editing_index: int | None = None
         self.edit_text: str = ""
-        self.cursor_blink_timer: int = 0
+        self.cursor_blink_ms = 250  # half-period, independent of the frame rate
+        self.cursor_blink_start: int = 0
+
+        # Rendered panel, rebuilt only when dirty or when the view key changes
+        self._dirty = True
+        self._cache: pygame.Surface | None = None
+        self._cache_key: tuple | None = None
+
+        self._layout()
 
     def _init_fonts(self):
         if not self._fonts_initialized:
@@ -73,22 +95,111 @@ class ParameterPanel:
             self.input_font = pygame.font.SysFont("consolas", 12)
             self._fonts_initialized = True
 
-    def _get_slider_rect(self, index: int) -> tuple[int, int, int, int]:
-        """Return (x, y, width, height) for the slider track."""
+            # Labels never change, so rasterize them once
+            self._label_imgs = [self.label_font.render(s.name, True, (50, 50, 50)) for s in self.sliders]
+
+    def _init_surfaces(self):
+        """Pre-draw the static track and handle graphics so rendering is just blits."""
+        if self._track_bg_surf is not None:
+            return
+
+        _, _, sw, sh = self._slider_rects[0] if self._slider_rects else (0, 0, 1, 1)
+        track_rect = pygame.Rect(0, 0, sw, sh)
+
+        self._track_bg_surf = pygame.Surface((sw, sh), pygame.SRCALPHA)
+        pygame.draw.rect(self._track_bg_surf, (220, 220, 220), track_rect, border_radius=4)
+
+        self._track_border_surf = pygame.Surface((sw, sh), pygame.SRCALPHA)
+        pygame.draw.rect(self._track_border_surf, (160, 160, 160), track_rect, 1, border_radius=4)
+
+        # One (normal, hover, dragging) triple per slider, since colors differ
+        r = self.handle_radius
+        center = (r + 1, r + 1)
+        self._handle_imgs = []
+        for slider in self.sliders:
+            imgs = []
+            for boost in (0, 20, 40):
+                handle_color = tuple(min(255, c + boost) for c in slider.color)
+                img = pygame.Surface((2 * r + 2, 2 * r + 2), pygame.SRCALPHA)
+                pygame.draw.circle(img, handle_color, center, r)
+                pygame.draw.circle(img, (60, 60, 60), center, r, 2)
+
+                # Inner highlight on handle
+                pygame.draw.circle(img, (255, 255, 255), (center[0] - 3, center[1] - 3), 3)
+                imgs.append(img)
+            self._handle_imgs.append(tuple(imgs))
+
+    def _init_chrome(self):
+        """Bake the panel shadow, background, border and title bar into one surface."""
+        if self._chrome_surf is not None:
+            return
+
+        surf = pygame.Surface((self.width + self.shadow_offset, self.height + self.shadow_offset), pygame.SRCALPHA)
+        shadow_rect = pygame.Rect(self.shadow_offset, self.shadow_offset, self.width, self.height)
+        pygame.draw.rect(surf, (180, 180, 180), shadow_rect, border_radius=12)
+
+        panel_rect = pygame.Rect(0, 0, self.width, self.height)
+        pygame.draw.rect(surf, (255, 255, 255), panel_rect, border_radius=12)
+        pygame.draw.rect(surf, (100, 100, 100), panel_rect, 2, border_radius=12)
+
+        # Title bar
+        title_rect = pygame.Rect(0, 0, self.width, self.title_height)
+        pygame.draw.rect(surf, (50, 55, 65), title_rect, border_top_left_radius=12, border_top_right_radius=12)
+
+        title_img = self.title_font.render(self.title, True, (240, 240, 240))
+        title_x = (self.width - title_img.get_width()) // 2
+        title_y = (self.title_height - title_img.get_height()) // 2
+        surf.blit(title_img, (title_x, title_y))
+
+        self._chrome_surf = surf
+
+    def _value_img(self, index: int, value_str: str) -> pygame.Surface:
+        """Rendered value text, cached by (slider index, formatted string)."""
+        key = (index, value_str)
+        img = self._value_cache.get(key)
+        if img is None:
+            img = self.input_font.render(value_str, True, (60, 60, 60))
+            if len(self._value_cache) >= self.value_cache_per_slider * len(self.sliders):
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._value_cache[next(iter(self._value_cache))]
+            self._value_cache[key] = img
+        return img
+
+    def _layout(self):
+        """Precompute hit-test and drawing rects for the current panel position."""
         # Label is on the left, then slider, then input box
         sx = self.x + self.padding + self.label_width + 6
-        sy = self.y + self.title_height + self.padding + index * self.slider_spacing + 6
         # Leave room for the input box on the right
         sw = self.width - self.padding - self.label_width - 6 - self.input_width - 8 - self.padding
         sh = self.slider_height
-        return sx, sy, sw, sh
+
+        self._slider_rects: list[tuple[int, int, int, int]] = []
+        self._input_rects: list[pygame.Rect] = []
+        for index in range(len(self.sliders)):
+            sy = self.y + self.title_height + self.padding + index * self.slider_spacing + 6
+            self._slider_rects.append((sx, sy, sw, sh))
+            iy = sy - (self.input_height - sh) // 2
+            self._input_rects.append(pygame.Rect(sx + sw + 6, iy, self.input_width, self.input_height))
+
+        # Inclusive of the right/bottom edge, matching the original bounds checks
+        self._panel_rect = pygame.Rect(self.x, self.y, self.width + 1, self.height + 1)
+        # Handles can overhang the panel edges slightly
+        self._hover_rect = self._panel_rect.inflate(2 * (self.handle_radius + 4), 0)
+
+    def set_position(self, x: int, y: int):
+        """Move the panel, recomputing its cached layout."""
+        self.x = x
+        self.y = y
+        self._layout()
+        self._dirty = True
+
+    def _get_slider_rect(self, index: int) -> tuple[int, int, int, int]:
+        """Return (x, y, width, height) for the slider track."""
+        return self._slider_rects[index]
 
     def _get_input_rect(self, index: int) -> pygame.Rect:
-        """Return the rect for the text input box."""
-        sx, sy, sw, sh = self._get_slider_rect(index)
-        ix = sx + sw + 6
-        iy = sy - (self.input_height - sh) // 2
-        return pygame.Rect(ix, iy, self.input_width, self.input_height)
+        """Return the rect for the text input box (shared; do not mutate)."""
+        return self._input_rects[index]
 
     def _get_handle_pos(self, index: int, value: float) -> tuple[int, int]:
         """Return (x, y) for the handle center."""
@@ -104,6 +215,16 @@ class ParameterPanel:
         """
         Handle mouse and keyboard events. Returns True if the event was consumed by the panel.
         """
+        # Fast reject for mouse events over the sim area; drags and edits still need
+        # to see events outside the panel (release, motion, click-away to commit)
+        if (
+            event.type in _MOUSE_EVENTS
+            and self.dragging_index is None
+            and self.editing_index is None
+            and not self._panel_rect.collidepoint(event.pos)
+        ):
+            return False
+
         # Handle text input when editing
         if self.editing_index is not None:
             if event.type == pygame.KEYDOWN:
@@ -115,6 +236,7 @@ class ParameterPanel:
                     return True
                 elif event.key == pygame.K_BACKSPACE:
                     self.edit_text = self.edit_text[:-1]
+                    self._dirty = True
                     return True
                 elif event.key == pygame.K_TAB:
                     # Move to next/previous input
@@ -128,6 +250,7 @@ class ParameterPanel:
                     return True
                 elif event.unicode and (event.unicode.isdigit() or event.unicode in '.-'):
                     self.edit_text += event.unicode
+                    self._dirty = True
                     return True
                 return True
 
@@ -135,8 +258,7 @@ class ParameterPanel:
                 mx, my = event.pos
                 # Check if clicking on a different input or outside
                 clicked_input = False
-                for i in range(len(self.sliders)):
-                    input_rect = self._get_input_rect(i)
+                for i, input_rect in enumerate(self._input_rects):
                     if input_rect.collidepoint(mx, my):
                         if i != self.editing_index:
                             self._commit_edit()
@@ -152,24 +274,22 @@ class ParameterPanel:
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             mx, my = event.pos
             # Check if click is within panel
-            if self.x <= mx <= self.x + self.width and self.y <= my <= self.y + self.height:
+            if self._panel_rect.collidepoint(mx, my):
                 # Check each input box first
-                for i in range(len(self.sliders)):
-                    input_rect = self._get_input_rect(i)
+                for i, input_rect in enumerate(self._input_rects):
                     if input_rect.collidepoint(mx, my):
                         self._start_edit(i)
                         return True
 
                 # Check each slider
-                ctrl = self.get_controller()
-                for i, slider in enumerate(self.sliders):
-                    sx, sy, sw, sh = self._get_slider_rect(i)
+                for i, (sx, sy, sw, sh) in enumerate(self._slider_rects):
 
                     # Check if near handle or on track
                     track_top = sy - 12
                     track_bottom = sy + sh + 12
                     if sx - 5 <= mx <= sx + sw + 5 and track_top <= my <= track_bottom:
                         self.dragging_index = i
+                        self._dirty = True
                         # Update value immediately on click
                         self._update_value_from_mouse(mx)
                         return True
@@ -178,6 +298,7 @@ class ParameterPanel:
         elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
             if self.dragging_index is not None:
                 self.dragging_index = None
+                self._dirty = True
                 return True
 
         elif event.type == pygame.MOUSEMOTION:
@@ -199,7 +320,8 @@ class ParameterPanel:
             self.edit_text = f"{value:.4f}".rstrip('0').rstrip('.')
         else:
             self.edit_text = f"{value:.2f}".rstrip('0').rstrip('.')
-        self.cursor_blink_timer = 0
+        self.cursor_blink_start = pygame.time.get_ticks()
+        self._dirty = True
 
     def _commit_edit(self):
         """Commit the current text edit."""
@@ -216,11 +338,13 @@ class ParameterPanel:
 
         self.editing_index = None
         self.edit_text = ""
+        self._dirty = True
 
     def _cancel_edit(self):
         """Cancel the current text edit."""
         self.editing_index = None
         self.edit_text = ""
+        self._dirty = True
 
     def _update_value_from_mouse(self, mx: int):
         """Update the currently dragged slider's value based on mouse x."""
@@ -240,6 +364,7 @@ class ParameterPanel:
         # Set on controller
         ctrl = self.get_controller()
         setattr(ctrl, slider.attr, value)
+        self._dirty = True
 
     def is_dragging(self) -> bool:
         """Return True if currently dragging a slider."""
@@ -249,47 +374,75 @@ class ParameterPanel:
         """Return True if currently editing a text input."""
         return self.editing_index is not None
 
-    def draw(self, surface: pygame.Surface):
-        """Draw the parameter panel."""
+    def _view_key(self, ctrl, mx: int, my: int) -> tuple:
+        """Everything the rendered panel depends on; a change means the cache is stale."""
+        values = tuple(getattr(ctrl, slider.attr, 0.0) for slider in self.sliders)
+
+        hover_handle = None
+        hover_input = None
+        if self._hover_rect.collidepoint(mx, my):
+            for i, value in enumerate(values):
+                hx, hy = self._get_handle_pos(i, value)
+                if abs(mx - hx) < self.handle_radius + 4 and abs(my - hy) < self.handle_radius + 4:
+                    hover_handle = i
+                if self._input_rects[i].collidepoint(mx, my):
+                    hover_input = i
+
+        blink_on = (
+            self.editing_index is not None
+            and ((pygame.time.get_ticks() - self.cursor_blink_start) // self.cursor_blink_ms) % 2 == 0
+        )
+        return (values, hover_handle, hover_input, self.dragging_index, self.editing_index, self.edit_text, blink_on)
+
+    def draw(self, surface: pygame.Surface) -> pygame.Rect:
+        """
+        Draw the parameter panel, re-rendering it only when something visible changed.
+        Returns the area of `surface` that was drawn.
+        """
         self._init_fonts()
+        self._init_chrome()
+        self._init_surfaces()
         ctrl = self.get_controller()
-        self.cursor_blink_timer += 1
 
-        # Panel background with subtle shadow
-        shadow_offset = 3
-        shadow_rect = pygame.Rect(self.x + shadow_offset, self.y + shadow_offset, self.width, self.height)
-        pygame.draw.rect(surface, (180, 180, 180), shadow_rect, border_radius=12)
+        mx, my = pygame.mouse.get_pos()
+        key = self._view_key(ctrl, mx, my)
 
-        panel_rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        pygame.draw.rect(surface, (255, 255, 255), panel_rect, border_radius=12)
-        pygame.draw.rect(surface, (100, 100, 100), panel_rect, 2, border_radius=12)
+        if self._dirty or self._cache is None or key != self._cache_key:
+            if self._cache is None:
+                self._cache = pygame.Surface(
+                    (self.width + self.shadow_offset, self.height + self.shadow_offset), pygame.SRCALPHA
+                ).convert_alpha()
+            self._cache.fill((0, 0, 0, 0))
+            self._render(self._cache, ctrl, key)
+            self._cache_key = key
+            self._dirty = False
 
-        # Title bar
-        title_rect = pygame.Rect(self.x, self.y, self.width, self.title_height)
-        pygame.draw.rect(surface, (50, 55, 65), title_rect, border_top_left_radius=12, border_top_right_radius=12)
+        return surface.blit(self._cache, (self.x, self.y))
 
-        title_img = self.title_font.render(self.title, True, (240, 240, 240))
-        title_x = self.x + (self.width - title_img.get_width()) // 2
-        title_y = self.y + (self.title_height - title_img.get_height()) // 2
-        surface.blit(title_img, (title_x, title_y))
+    def _render(self, surface: pygame.Surface, ctrl, key: tuple):
+        """Render the whole panel onto `surface` with the panel origin at (0, 0)."""
+        values, hover_handle, hover_input, _, _, _, blink_on = key
+        ox, oy = -self.x, -self.y
 
-        # Draw each slider
-        mx, my = pygame.mouse.get_pos()
+        # Shadow, background, border and title bar never change
+        surface.blit(self._chrome_surf, (0, 0))
 
+        # Draw each slider
         for i, slider in enumerate(self.sliders):
             sx, sy, sw, sh = self._get_slider_rect(i)
-            value = getattr(ctrl, slider.attr, 0.0)
+            sx, sy = sx + ox, sy + oy
+            value = values[i]
             hx, hy = self._get_handle_pos(i, value)
+            hx, hy = hx + ox, hy + oy
 
             # Label on the left
-            label_img = self.label_font.render(slider.name, True, (50, 50, 50))
-            label_x = self.x + self.padding
+            label_img = self._label_imgs[i]
+            label_x = self.padding
             label_y = sy + (sh - label_img.get_height()) // 2
             surface.blit(label_img, (label_x, label_y))
 
             # Track background
-            track_rect = pygame.Rect(sx, sy, sw, sh)
-            pygame.draw.rect(surface, (220, 220, 220), track_rect, border_radius=4)
+            surface.blit(self._track_bg_surf, (sx, sy))
 
             # Filled portion (clamp norm for display)
             norm = (value - slider.min_val) / (slider.max_val - slider.min_val) if slider.max_val > slider.min_val else 0.0
@@ -300,29 +453,23 @@ class ParameterPanel:
                 pygame.draw.rect(surface, slider.color, fill_rect, border_radius=4)
 
             # Track border
-            pygame.draw.rect(surface, (160, 160, 160), track_rect, 1, border_radius=4)
+            surface.blit(self._track_border_surf, (sx, sy))
 
             # Handle (only show if value is within slider range)
             if 0.0 <= norm <= 1.0:
-                is_dragging_this = self.dragging_index == i
-                is_hover = abs(mx - hx) < self.handle_radius + 4 and abs(my - hy) < self.handle_radius + 4
-
-                if is_dragging_this:
-                    handle_color = tuple(min(255, c + 40) for c in slider.color)
-                elif is_hover:
-                    handle_color = tuple(min(255, c + 20) for c in slider.color)
+                normal_img, hover_img, drag_img = self._handle_imgs[i]
+                if self.dragging_index == i:
+                    handle_img = drag_img
+                elif hover_handle == i:
+                    handle_img = hover_img
                 else:
-                    handle_color = slider.color
+                    handle_img = normal_img
 
-                pygame.draw.circle(surface, handle_color, (hx, hy), self.handle_radius)
-                pygame.draw.circle(surface, (60, 60, 60), (hx, hy), self.handle_radius, 2)
-
-                # Inner highlight on handle
-                highlight_pos = (hx - 3, hy - 3)
-                pygame.draw.circle(surface, (255, 255, 255), highlight_pos, 3)
+                c = self.handle_radius + 1
+                surface.blit(handle_img, (hx - c, hy - c))
 
             # Text input box
-            input_rect = self._get_input_rect(i)
+            input_rect = self._get_input_rect(i).move(ox, oy)
             is_editing_this = self.editing_index == i
 
             if is_editing_this:
@@ -338,14 +485,14 @@ class ParameterPanel:
                 surface.blit(text_img, (text_x, text_y))
 
                 # Blinking cursor
-                if (self.cursor_blink_timer // 30) % 2 == 0:
+                if blink_on:
                     cursor_x = text_x + text_img.get_width() + 1
                     cursor_y1 = input_rect.y + 3
                     cursor_y2 = input_rect.bottom - 3
                     pygame.draw.line(surface, (30, 30, 30), (cursor_x, cursor_y1), (cursor_x, cursor_y2), 2)
             else:
                 # Inactive input style
-                input_hover = input_rect.collidepoint(mx, my)
+                input_hover = hover_input == i
                 bg_color = (245, 245, 245) if not input_hover else (250, 250, 250)
                 border_color = (180, 180, 180) if not input_hover else (140, 140, 140)
 
@@ -357,7 +504,7 @@ class ParameterPanel:
                     value_str = f"{value:.4f}".rstrip('0').rstrip('.')
                 else:
                     value_str = f"{value:.2f}".rstrip('0').rstrip('.')
-                text_img = self.input_font.render(value_str, True, (60, 60, 60))
+                text_img = self._value_img(i, value_str)
                 text_x = input_rect.x + 4
                 text_y = input_rect.y + (input_rect.height - text_img.get_height()) // 2
                 surface.blit(text_img, (text_x, text_y))
@@ -0,0 +1,47 @@
+import numpy as np
+
+
+class HistoryRing:
+    """
+    Fixed-size ring buffer of simulation samples, stored as one (6, n) array:
+    rows are t, x, x_dot, theta, theta_dot, force.
+    """
+
+    T, X, X_DOT, THETA, THETA_DOT, FORCE = range(6)
+
+    def __init__(self, n: int):
+        self.n = n
+        self.buf = np.zeros((6, n), dtype=np.float64)
+        self.i = 0
+        self.full = False
+        # Oldest-first copy handed out by snapshot() once the ring has wrapped
+        self._ordered = np.empty_like(self.buf)
+
+    def __len__(self) -> int:
+        return self.n if self.full else self.i
+
+    def clear(self) -> None:
+        self.i = 0
+        self.full = False
+
+    def push(self, t: float, x: float, x_dot: float, theta: float, theta_dot: float, force: float) -> None:
+        self.buf[:, self.i] = (t, x, x_dot, theta, theta_dot, force)
+        self.i += 1
+        if self.i == self.n:
+            self.i = 0
+            self.full = True
+
+    def snapshot(self) -> np.ndarray:
+        """
+        Return the samples oldest-first as a (6, len) array.
+        This is a view into internal storage, valid until the next push.
+        """
+        if not self.full:
+            return self.buf[:, :self.i]
+        if self.i == 0:
+            return self.buf
+
+        k = self.n - self.i
+        self._ordered[:, :k] = self.buf[:, self.i:]
+        self._ordered[:, k:] = self.buf[:, :self.i]
+        return self._ordered
@@ -1,23 +1,41 @@
+import functools
 import math
 import sys
-from collections import deque
 
 import numpy as np
 import pygame
 
 from controller import controller, reset_controller, get_controller
-from dynamics import rk4_step
+from dynamics_numba import INTEGRATORS, step_n, warmup_step_n
 from gui import ParameterPanel, SliderConfig
-from metrics import Metrics
+from history import HistoryRing
+from metrics import Metrics, warmup_metrics
 from params import P
 from plotting import draw_plot, draw_phase_plot
-from utils import clamp, mechanical_energy, mouse_force, wrap_angle
+from utils import clamp, mouse_force, wrap_angle
+from utils_fast import hud_stats, warmup_hud_stats
+
+
+# Start/end fractions of each dash along the reference-theta line
+DASH_N = 18
+DASH_A = np.arange(DASH_N) / DASH_N
+DASH_B = (np.arange(DASH_N) + 0.5) / DASH_N
+
+# Pole sprites are rotated in half-degree steps
+HALF_DEG_PER_RAD = 360.0 / math.pi
+
+# Reference nudge rates while Q/A or W/S are held
+REF_X_RATE = 1.2                     # m/s
+REF_THETA_RATE = math.radians(60.0)  # rad/s
 
 
 # -----------------------------
 # Main
 # -----------------------------
 def main():
+    if P.integrator not in INTEGRATORS:
+        raise ValueError(f"Unknown integrator {P.integrator!r}; expected one of {INTEGRATORS}")
+
     pygame.init()
     pygame.display.set_caption("Cart-Pole Playground (constraints + refs + metrics + history)")
 
@@ -27,6 +45,17 @@ def main():
     clock = pygame.time.Clock()
     hud_font = pygame.font.SysFont("consolas", 16)
 
+    # JIT the Numba kernels behind a loading frame, so the first simulated
+    # frame does not stall with a blank or frozen window
+    screen.fill((245, 245, 245))
+    splash = hud_font.render("Compiling physics kernels...", True, (20, 20, 20))
+    screen.blit(splash, splash.get_rect(center=(W // 2, H // 2)))
+    pygame.display.flip()
+    pygame.event.pump()
+    warmup_step_n()
+    warmup_hud_stats()
+    warmup_metrics()
+
     ppm = P.pixels_per_meter
     track_y = int(H * 0.72)
 
@@ -40,6 +69,84 @@ def main():
     x_min_m = (x_min_px - W / 2) / ppm
     x_max_m = (x_max_px - W / 2) / ppm
 
+    # Static screen geometry (only the cart's x changes from frame to frame)
+    W_half = W / 2
+    cart_y_px = track_y - cart_h // 2
+    pivot_y = cart_y_px - cart_h // 2 + int(0.04 * ppm)
+    wheel_y = track_y + wheel_r
+    wheel_dx = cart_w // 4
+    pole_tip_r = max(10, int(0.06 * ppm))
+    sat_bar_w = 40
+    sat_bar_h = 4
+    sat_bar_y = cart_y_px + cart_h // 2 + 4
+    ref_bar_y0 = track_y - 90
+    ref_bar_y1 = track_y + 30
+    force_to_px_scale = 4.0  # pixels per Newton, common to all force indicators
+    force_bar_y = track_y - 105
+    mouse_bar_y = track_y - 95
+
+    # Cart sprites: body, border, saturation bar and wheels only translate, so
+    # draw them once per saturation state and blit. Offsets are relative to
+    # (cart_x_px, cart top); the +1 margins cover circle rasterisation.
+    sprite_dx = min(-(cart_w // 2), -wheel_dx - wheel_r, -(sat_bar_w // 2)) - 1
+    sprite_w = max(cart_w - cart_w // 2, wheel_dx + wheel_r, sat_bar_w - sat_bar_w // 2) + 1 - sprite_dx
+    sprite_top = cart_y_px - cart_h // 2
+    sprite_h = max(wheel_y + wheel_r, sat_bar_y + sat_bar_h) + 1 - sprite_top
+
+    def make_cart_sprite(color, border, saturated):
+        sprite = pygame.Surface((sprite_w, sprite_h), pygame.SRCALPHA)
+        cx = -sprite_dx
+        body = pygame.Rect(cx - cart_w // 2, 0, cart_w, cart_h)
+        pygame.draw.rect(sprite, color, body, border_radius=10)
+        pygame.draw.rect(sprite, border, body, 2, border_radius=10)
+        if saturated:
+            pygame.draw.rect(sprite, (220, 60, 30), (cx - sat_bar_w // 2, sat_bar_y - sprite_top, sat_bar_w, sat_bar_h), border_radius=2)
+        pygame.draw.circle(sprite, (40, 40, 40), (cx - wheel_dx, wheel_y - sprite_top), wheel_r)
+        pygame.draw.circle(sprite, (40, 40, 40), (cx + wheel_dx, wheel_y - sprite_top), wheel_r)
+        return sprite.convert_alpha()
+
+    cart_sprite_normal = make_cart_sprite((30, 120, 200), (20, 20, 20), False)  # Normal blue
+    cart_sprite_sat = make_cart_sprite((200, 80, 50), (180, 40, 20), True)      # Orange-red when saturated
+
+    # Pole sprites: drawn upright with the pivot on the bottom edge
+    pole_cx = pole_tip_r + 1
+    pole_pivot_y = pole_tip_r + 1 + pole_len_px
+    pole_surf = pygame.Surface((2 * pole_cx, pole_pivot_y + 1), pygame.SRCALPHA)
+    pygame.draw.line(pole_surf, (200, 50, 50), (pole_cx, pole_pivot_y), (pole_cx, pole_pivot_y - pole_len_px), P.pole_thickness_px)
+    pygame.draw.circle(pole_surf, (120, 0, 0), (pole_cx, pole_pivot_y - pole_len_px), pole_tip_r)
+    pole_surf = pole_surf.convert_alpha()
+
+    ref_pole_surf = pygame.Surface((4, pole_len_px + 2), pygame.SRCALPHA)
+    ref_pivot_y = pole_len_px + 1
+    for a, b in zip(DASH_A, DASH_B):
+        pygame.draw.line(ref_pole_surf, (140, 140, 140), (2, ref_pivot_y - int(a * pole_len_px)), (2, ref_pivot_y - int(b * pole_len_px)), 2)
+    ref_pole_surf = ref_pole_surf.convert_alpha()
+
+    def rotation_cache(surf, pivot, maxsize):
+        """
+        Memoise rotations of `surf` by half-degree bucket. Each entry is
+        (image, ox, oy): blit at (pivot_x - ox, pivot_y - oy) to put `pivot`
+        (in `surf` coordinates) on the screen pivot.
+        """
+        # rotate() keeps the image centre fixed, so track the pivot's offset from it
+        vx = pivot[0] - surf.get_width() / 2
+        vy = pivot[1] - surf.get_height() / 2
+
+        @functools.lru_cache(maxsize=maxsize)
+        def rotated(bucket):
+            img = pygame.transform.rotate(surf, -0.5 * bucket)
+            s = math.sin(-bucket / HALF_DEG_PER_RAD)
+            c = math.cos(-bucket / HALF_DEG_PER_RAD)
+            ox = img.get_width() / 2 + vx * c + vy * s
+            oy = img.get_height() / 2 - vx * s + vy * c
+            return img, int(ox), int(oy)
+        return rotated
+
+    # The free pole sweeps through every angle, so its cache is kept small;
+    # the reference only moves while W/S is held
+    rotated_pole = rotation_cache(pole_surf, (pole_cx, pole_pivot_y), maxsize=128)
+    rotated_ref_pole = rotation_cache(ref_pole_surf, (2, ref_pivot_y), maxsize=32)
+
     ref_x = 0.0
     ref_theta = 0.0
 
@@ -47,6 +154,7 @@ def main():
         return np.array([0.0, 0.0, 0.15, 0.0], dtype=float)
 
     state = reset_state()
+    ctrl_state_buf = np.empty(4)
     t = 0.0
     paused = False
     show_history = P.plot_enabled_default
@@ -56,10 +164,19 @@ def main():
 
     key_force = 0.0
     key_force_mag = 18.0
+    # Indexed by the LEFT/RIGHT bits of the key mask: none, left, right, both
+    key_force_lut = (0.0, -key_force_mag, key_force_mag, 0.0)
 
     metrics = Metrics()
     metrics.reset()
 
+    semi_implicit = P.integrator == "semi_implicit"
+
+    # Simulated time per displayed frame; per-frame increments are scaled by it
+    frame_dt = P.substeps * P.dt
+    ref_x_step = REF_X_RATE * frame_dt
+    ref_theta_step = REF_THETA_RATE * frame_dt
+
     # Controller parameter panel
     param_panel = ParameterPanel(
         x=12,
@@ -74,42 +191,42 @@ def main():
         title="Controller Gains",
     )
 
-    hist_t = deque(maxlen=P.history_len)
-    hist_x = deque(maxlen=P.history_len)
-    hist_x_dot = deque(maxlen=P.history_len)
-    hist_theta = deque(maxlen=P.history_len)
-    hist_theta_dot = deque(maxlen=P.history_len)
-    hist_force = deque(maxlen=P.history_len)
-
-    def push_history(tt, st, force):
-        hist_t.append(tt)
-        hist_x.append(float(st[0]))
-        hist_x_dot.append(float(st[1]))
-        hist_theta.append(float(wrap_angle(st[2])))
-        hist_theta_dot.append(float(st[3]))
-        hist_force.append(float(force))
-
-    def cart_px_from_x(x_m: float) -> float:
-        return W / 2 + x_m * ppm
+    history = HistoryRing(P.history_len)
+
+    # History plots: time series column + phase diagram column, drawn off-screen
+    pad = 12
+    plot_w = 320
+    plot_h = 94
+    phase_size = 145
+    phase_x0 = plot_w + 8
+    x_dot_max = 3.0        # Velocity ranges (approximate)
+    theta_dot_max = 8.0
+    plot_origin = (W - plot_w - phase_size - pad - 8, pad)
+    plot_surface = pygame.Surface((phase_x0 + phase_size, max(3 * plot_h + 16, 2 * phase_size + 8))).convert()
+    plot_refresh_hz = 60  # plot redraw rate, whatever the display rate
+    plot_redraw_every = max(1, round(P.display_fps / plot_refresh_hz))
+    plots_stale = True
+    last_plot_frame = 0
+    frame_idx = 0
+
+    # Static help lines stay cached; numeric lines miss only when their text changes
+    @functools.lru_cache(maxsize=128)
+    def render_hud_line(text):
+        return hud_font.render(text, True, (20, 20, 20))
 
     def draw_text_lines(x, y, lines):
         yy = y
+        area = pygame.Rect(x, y, 0, 0)
         for line in lines:
-            img = hud_font.render(line, True, (20, 20, 20))
-            screen.blit(img, (x, yy))
+            img = render_hud_line(line)
+            area.union_ip(screen.blit(img, (x, yy)))
             yy += img.get_height() + 2
+        return area
 
-    def constraint_flag(st: np.ndarray, force_total: float) -> bool:
-        eps = 1e-6
-        x = float(st[0])
-
-        at_left = x <= x_min_m + eps
-        at_right = x >= x_max_m - eps
-
-        pushing_left = force_total < 0.0
-        pushing_right = force_total > 0.0
-
-        return (at_left and pushing_left) or (at_right and pushing_right)
+    # With the plots hidden only the rects drawn this frame or the last one can
+    # differ from what is on screen, so push just those instead of flipping
+    prev_dirty = []
+    full_redraw = True
 
     running = True
     while running:
@@ -122,6 +239,9 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
 
+            elif event.type == pygame.WINDOWEXPOSED:
+                full_redraw = True
+
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
@@ -130,11 +250,14 @@ def main():
                     t = 0.0
                     metrics.reset()
                     reset_controller()
-                    hist_t.clear(); hist_x.clear(); hist_x_dot.clear(); hist_theta.clear(); hist_theta_dot.clear(); hist_force.clear()
+                    history.clear()
+                    plots_stale = True
                 elif event.key == pygame.K_SPACE:
                     paused = not paused
                 elif event.key == pygame.K_h:
                     show_history = not show_history
+                    plots_stale = True
+                    full_redraw = True
                 elif event.key == pygame.K_c:
                     ref_x = 0.0
                     ref_theta = 0.0
@@ -145,26 +268,21 @@ def main():
 
         # Disable keyboard controls while editing text input
         if not param_panel.is_editing():
+            mask = (
+                keys[pygame.K_LEFT]
+                | (keys[pygame.K_RIGHT] << 1)
+                | (keys[pygame.K_q] << 2)
+                | (keys[pygame.K_a] << 3)
+                | (keys[pygame.K_w] << 4)
+                | (keys[pygame.K_s] << 5)
+            )
+
             # Keyboard force
-            if keys[pygame.K_LEFT] and not keys[pygame.K_RIGHT]:
-                key_force = -key_force_mag
-            elif keys[pygame.K_RIGHT] and not keys[pygame.K_LEFT]:
-                key_force = key_force_mag
-            else:
-                key_force = 0.0
+            key_force = key_force_lut[mask & 3]
 
             # Reference adjustments
-            if keys[pygame.K_q]:
-                ref_x -= 0.01
-            if keys[pygame.K_a]:
-                ref_x += 0.01
-            ref_x = clamp(ref_x, x_min_m, x_max_m)
-
-            if keys[pygame.K_w]:
-                ref_theta += math.radians(0.5)
-            if keys[pygame.K_s]:
-                ref_theta -= math.radians(0.5)
-            ref_theta = wrap_angle(ref_theta)
+            ref_x = clamp(ref_x + ref_x_step * (((mask >> 3) & 1) - ((mask >> 2) & 1)), x_min_m, x_max_m)
+            ref_theta = wrap_angle(ref_theta + ref_theta_step * (((mask >> 4) & 1) - ((mask >> 5) & 1)))
         else:
             key_force = 0.0
 
@@ -181,134 +299,93 @@ def main():
         cart_damp = P.cart_damping if friction_on else 0.0
         pole_damp = P.pole_damping if friction_on else 0.0
 
+        # The array is only touched by the kernels and the controller copy; the
+        # rest of the frame works on plain float locals
+        x, x_dot, theta, theta_dot = state.tolist()
+
         # Forces
-        u_raw = controller(state.copy(), t, ref_x, ref_theta)
+        # Hand the controller a reused copy so it can never corrupt the sim state
+        np.copyto(ctrl_state_buf, state)
+        u_raw = controller(ctrl_state_buf, t, ref_x, ref_theta)
         u = clamp(u_raw, -P.max_force, P.max_force)
         is_saturated = abs(u_raw) > P.max_force
 
-        cart_x_px = cart_px_from_x(state[0])
+        cart_x_px = W_half + x * ppm
         f_mouse = mouse_force(cart_x_px, mx, left_down, right_down)
         f_total = float(u + f_mouse + key_force)
 
         # Integrate
         if not paused:
-            for _ in range(P.substeps):
-                constrained = constraint_flag(state, f_total)
-
-                if constrained:
-                    if state[0] <= x_min_m:
-                        state[0] = x_min_m
-                    if state[0] >= x_max_m:
-                        state[0] = x_max_m
-                    state[1] = 0.0
-
-                state = rk4_step(state, f_total, P.dt, constrained, cart_damp, pole_damp)
-
-                # Safety clamp
-                if state[0] < x_min_m:
-                    state[0] = x_min_m
-                    if state[1] < 0:
-                        state[1] = 0.0
-                elif state[0] > x_max_m:
-                    state[0] = x_max_m
-                    if state[1] > 0:
-                        state[1] = 0.0
-
-                t += P.dt
-                metrics.update(state, t, f_total, ref_x, ref_theta, P.dt)
+            step_n(
+                state, f_total, P.dt, P.substeps, x_min_m, x_max_m,
+                cart_damp, pole_damp, P.M, P.m, P.l, P.g, semi_implicit,
+            )
+            t += frame_dt
+            # One update per frame: the force is constant over the substeps
+            metrics.update(state, t, f_total, ref_x, ref_theta, frame_dt)
 
-            push_history(t, state, f_total)
+            x, x_dot, theta, theta_dot = state.tolist()
+            history.push(t, x, x_dot, wrap_angle(theta), theta_dot, f_total)
 
         # Draw
+        # Runs of draw primitives hold one screen lock instead of locking per call;
+        # blits need the screen unlocked, so sprites and text sit outside them
         screen.fill((245, 245, 245))
-        pygame.draw.line(screen, (60, 60, 60), (0, track_y), (W, track_y), 3)
+        screen.lock()
+        try:
+            pygame.draw.line(screen, (60, 60, 60), (0, track_y), (W, track_y), 3)
 
-        # Reference x line
-        ref_x_px = int(cart_px_from_x(ref_x))
-        pygame.draw.line(screen, (120, 120, 120), (ref_x_px, track_y - 90), (ref_x_px, track_y + 30), 2)
+            # Reference x line
+            ref_x_px = int(W_half + ref_x * ppm)
+            ref_line_area = pygame.draw.line(screen, (120, 120, 120), (ref_x_px, ref_bar_y0), (ref_x_px, ref_bar_y1), 2)
+        finally:
+            screen.unlock()
 
         # Cart
-        cart_x_px = int(cart_px_from_x(state[0]))
-        cart_y_px = track_y - cart_h // 2
-        cart_rect = pygame.Rect(cart_x_px - cart_w // 2, cart_y_px - cart_h // 2, cart_w, cart_h)
-
-        # Change cart color when saturated
-        if is_saturated:
-            cart_color = (200, 80, 50)  # Orange-red when saturated
-            cart_border = (180, 40, 20)
-        else:
-            cart_color = (30, 120, 200)  # Normal blue
-            cart_border = (20, 20, 20)
+        cart_x_px = int(W_half + x * ppm)
 
-        pygame.draw.rect(screen, cart_color, cart_rect, border_radius=10)
-        pygame.draw.rect(screen, cart_border, cart_rect, 2, border_radius=10)
-
-        # Saturation indicator bar below cart
-        if is_saturated:
-            sat_bar_w = 40
-            sat_bar_h = 4
-            sat_bar_x = cart_x_px - sat_bar_w // 2
-            sat_bar_y = cart_y_px + cart_h // 2 + 4
-            pygame.draw.rect(screen, (220, 60, 30), (sat_bar_x, sat_bar_y, sat_bar_w, sat_bar_h), border_radius=2)
-
-        # Wheels
-        pygame.draw.circle(screen, (40, 40, 40), (cart_x_px - cart_w // 4, track_y + wheel_r), wheel_r)
-        pygame.draw.circle(screen, (40, 40, 40), (cart_x_px + cart_w // 4, track_y + wheel_r), wheel_r)
+        # Change cart color (and show the bar below it) when saturated
+        cart_sprite = cart_sprite_sat if is_saturated else cart_sprite_normal
+        scene_area = screen.blit(cart_sprite, (cart_x_px + sprite_dx, sprite_top))
 
         # Pivot
         pivot_x = cart_x_px
-        pivot_y = cart_y_px - cart_h // 2 + int(0.04 * ppm)
 
-        theta = float(state[2])
-        end_x = int(pivot_x + pole_len_px * math.sin(theta))
-        end_y = int(pivot_y - pole_len_px * math.cos(theta))
-        pygame.draw.line(screen, (200, 50, 50), (pivot_x, pivot_y), (end_x, end_y), P.pole_thickness_px)
-        pygame.draw.circle(screen, (120, 0, 0), (end_x, end_y), max(10, int(0.06 * ppm)))
-        pygame.draw.circle(screen, (20, 20, 20), (pivot_x, pivot_y), 6)
+        pole_img, ox, oy = rotated_pole(round(theta * HALF_DEG_PER_RAD))
+        scene_area.union_ip(screen.blit(pole_img, (pivot_x - ox, pivot_y - oy)))
+        scene_area.union_ip(pygame.draw.circle(screen, (20, 20, 20), (pivot_x, pivot_y), 6))
 
         # Reference theta dashed line
-        ref_end_x = int(pivot_x + pole_len_px * math.sin(ref_theta))
-        ref_end_y = int(pivot_y - pole_len_px * math.cos(ref_theta))
-        dash_n = 18
-        for i in range(dash_n):
-            a = i / dash_n
-            b = (i + 0.5) / dash_n
-            x1 = int(pivot_x + a * (ref_end_x - pivot_x))
-            y1 = int(pivot_y + a * (ref_end_y - pivot_y))
-            x2 = int(pivot_x + b * (ref_end_x - pivot_x))
-            y2 = int(pivot_y + b * (ref_end_y - pivot_y))
-            pygame.draw.line(screen, (140, 140, 140), (x1, y1), (x2, y2), 2)
-
-        # Force indicators - common scale for all forces
-        force_to_px_scale = 4.0  # pixels per Newton
-
-        # Controller force indicator (muted grey bar)
-        if abs(u) > 0.1:
-            force_bar_len = int(u * force_to_px_scale)
-            force_bar_y = track_y - 105
-            pygame.draw.line(screen, (140, 140, 140), (cart_x_px, force_bar_y), (cart_x_px + force_bar_len, force_bar_y), 3)
-
-        # Mouse force indicator
-        if abs(f_mouse) > 0.1:
-            mouse_bar_len = int(f_mouse * force_to_px_scale)
-            mouse_bar_y = track_y - 95
-            pygame.draw.line(screen, (0, 0, 0), (cart_x_px, mouse_bar_y), (cart_x_px + mouse_bar_len, mouse_bar_y), 2)
-            pygame.draw.circle(screen, (0, 0, 0), (cart_x_px + mouse_bar_len, mouse_bar_y), 5)
+        ref_img, ox, oy = rotated_ref_pole(round(ref_theta * HALF_DEG_PER_RAD))
+        scene_area.union_ip(screen.blit(ref_img, (pivot_x - ox, pivot_y - oy)))
+
+        screen.lock()
+        try:
+            # Controller force indicator (muted grey bar)
+            if abs(u) > 0.1:
+                force_bar_len = int(u * force_to_px_scale)
+                scene_area.union_ip(pygame.draw.line(screen, (140, 140, 140), (cart_x_px, force_bar_y), (cart_x_px + force_bar_len, force_bar_y), 3))
+
+            # Mouse force indicator
+            if abs(f_mouse) > 0.1:
+                mouse_bar_len = int(f_mouse * force_to_px_scale)
+                scene_area.union_ip(pygame.draw.line(screen, (0, 0, 0), (cart_x_px, mouse_bar_y), (cart_x_px + mouse_bar_len, mouse_bar_y), 2))
+                scene_area.union_ip(pygame.draw.circle(screen, (0, 0, 0), (cart_x_px + mouse_bar_len, mouse_bar_y), 5))
+        finally:
+            screen.unlock()
 
         # Parameter panel
-        param_panel.draw(screen)
+        panel_area = param_panel.draw(screen)
 
         # HUD
-        E = mechanical_energy(state)
-        theta_err = wrap_angle(theta - ref_theta)
-        x_err = float(state[0] - ref_x)
+        E, theta_err, x_err = hud_stats(state, ref_x, ref_theta, P.M, P.m, P.l, P.g)
 
         settle_str = "—" if metrics.settle_time is None else f"{metrics.settle_time: .2f}s"
 
         hud_lines = [
             f"t={t:7.3f}s  paused={paused}  history(H)={show_history}  friction(F)={'ON' if friction_on else 'OFF'}",
-            f"x={state[0]: .3f}m  x_dot={state[1]: .3f}m/s  (err {x_err:+.3f}m, ref {ref_x:+.3f}m)",
-            f"theta={theta: .3f}rad  theta_dot={state[3]: .3f}rad/s  (err {theta_err:+.3f}rad, ref {ref_theta:+.3f}rad)",
+            f"x={x: .3f}m  x_dot={x_dot: .3f}m/s  (err {x_err:+.3f}m, ref {ref_x:+.3f}m)",
+            f"theta={theta: .3f}rad  theta_dot={theta_dot: .3f}rad/s  (err {theta_err:+.3f}rad, ref {ref_theta:+.3f}rad)",
             f"u={u:+.2f}N  mouse={f_mouse:+.2f}N  keys={key_force:+.2f}N  total={f_total:+.2f}N",
             f"Max |theta_err|={metrics.max_abs_theta: .3f}rad   Max |x_err|={metrics.max_abs_x_dev: .3f}m",
             f"Settling time={settle_str}  (band: |x|<={P.settle_x_thresh}m, |theta|<={math.degrees(P.settle_theta_thresh):.1f}deg for {P.settle_hold_time}s)",
@@ -316,72 +393,74 @@ def main():
             "Controls: ←/→ force | LMB drag spring | RMB shove | Q/A ref x | W/S ref theta | C center refs",
             "          F friction | R reset | Space pause | H plots | Esc quit",
         ]
-        draw_text_lines(12, 12, hud_lines)
+        hud_area = draw_text_lines(12, 12, hud_lines)
 
-        # Plots
+        # Plots (re-rendered off-screen every plot_redraw_every frames, blitted every frame)
         if show_history:
-            pad = 12
-            plot_w = 320
-            plot_h = 94
-            phase_size = 145
-
-            # Time series plots on the left column of the right panel area
-            x0 = W - plot_w - phase_size - pad - 8
-            y0 = pad
-
-            hx = list(hist_x)
-            hxd = list(hist_x_dot)
-            ht = list(hist_theta)
-            htd = list(hist_theta_dot)
-            hf = list(hist_force)
-
-            draw_plot(screen, pygame.Rect(x0, y0, plot_w, plot_h), hx, ymin=x_min_m, ymax=x_max_m, label="x (m)", ref_value=ref_x)
-            draw_plot(screen, pygame.Rect(x0, y0 + plot_h + 8, plot_w, plot_h), ht, ymin=-math.pi, ymax=math.pi, label="theta (rad)", ref_value=ref_theta)
-            draw_plot(
-                screen,
-                pygame.Rect(x0, y0 + 2 * (plot_h + 8), plot_w, plot_h),
-                hf,
-                ymin=-(P.max_force + P.max_mouse_force + key_force_mag),
-                ymax=(P.max_force + P.max_mouse_force + key_force_mag),
-                label="force (N)",
-                ref_value=0.0
-            )
-
-            # Phase diagrams on the right column
-            phase_x0 = x0 + plot_w + 8
-            phase_y0 = y0
-
-            # Velocity ranges (approximate)
-            x_dot_max = 3.0
-            theta_dot_max = 8.0
-
-            draw_phase_plot(
-                screen,
-                pygame.Rect(phase_x0, phase_y0, phase_size, phase_size),
-                hx, hxd,
-                xmin=x_min_m, xmax=x_max_m,
-                ymin=-x_dot_max, ymax=x_dot_max,
-                x_label="x",
-                y_label="x_dot",
-                color=(70, 140, 200),
-                current_x=state[0],
-                current_y=state[1],
-            )
-            draw_phase_plot(
-                screen,
-                pygame.Rect(phase_x0, phase_y0 + phase_size + 8, phase_size, phase_size),
-                ht, htd,
-                xmin=-math.pi, xmax=math.pi,
-                ymin=-theta_dot_max, ymax=theta_dot_max,
-                x_label="θ",
-                y_label="θ_dot",
-                color=(200, 80, 80),
-                current_x=state[2],
-                current_y=state[3],
-            )
+            if plots_stale or frame_idx - last_plot_frame >= plot_redraw_every:
+                plot_surface.fill((245, 245, 245))
+
+                h = history.snapshot()
+                hx = h[HistoryRing.X]
+                hxd = h[HistoryRing.X_DOT]
+                ht = h[HistoryRing.THETA]
+                htd = h[HistoryRing.THETA_DOT]
+                hf = h[HistoryRing.FORCE]
+
+                # Time series plots on the left column
+                draw_plot(plot_surface, pygame.Rect(0, 0, plot_w, plot_h), hx, ymin=x_min_m, ymax=x_max_m, label="x (m)", ref_value=ref_x)
+                draw_plot(plot_surface, pygame.Rect(0, plot_h + 8, plot_w, plot_h), ht, ymin=-math.pi, ymax=math.pi, label="theta (rad)", ref_value=ref_theta)
+                draw_plot(
+                    plot_surface,
+                    pygame.Rect(0, 2 * (plot_h + 8), plot_w, plot_h),
+                    hf,
+                    ymin=-(P.max_force + P.max_mouse_force + key_force_mag),
+                    ymax=(P.max_force + P.max_mouse_force + key_force_mag),
+                    label="force (N)",
+                    ref_value=0.0
+                )
+
+                # Phase diagrams on the right column
+                draw_phase_plot(
+                    plot_surface,
+                    pygame.Rect(phase_x0, 0, phase_size, phase_size),
+                    hx, hxd,
+                    xmin=x_min_m, xmax=x_max_m,
+                    ymin=-x_dot_max, ymax=x_dot_max,
+                    x_label="x",
+                    y_label="x_dot",
+                    color=(70, 140, 200),
+                    current_x=x,
+                    current_y=x_dot,
+                )
+                draw_phase_plot(
+                    plot_surface,
+                    pygame.Rect(phase_x0, phase_size + 8, phase_size, phase_size),
+                    ht, htd,
+                    xmin=-math.pi, xmax=math.pi,
+                    ymin=-theta_dot_max, ymax=theta_dot_max,
+                    x_label="θ",
+                    y_label="θ_dot",
+                    color=(200, 80, 80),
+                    current_x=theta,
+                    current_y=theta_dot,
+                )
+
+                last_plot_frame = frame_idx
+                plots_stale = False
+
+            screen.blit(plot_surface, plot_origin)
+
+        dirty = [scene_area, ref_line_area, panel_area, hud_area]
+        if show_history or full_redraw:
+            pygame.display.flip()
+            full_redraw = False
+        else:
+            pygame.display.update(dirty + prev_dirty)
+        prev_dirty = dirty
 
-        pygame.display.flip()
-        clock.tick(120)
+        clock.tick(P.display_fps)
+        frame_idx += 1
 
     pygame.quit()
     sys.exit(0)
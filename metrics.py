@@ -1,45 +1,77 @@
-from dataclasses import dataclass
-
 import numpy as np
+from numba import njit
 
 from params import P
-from utils import wrap_angle
+from utils_fast import wrap_angle
+
+# Slots in the metrics state vector; negative times stand for "not yet"
+_MAX_THETA, _MAX_X_DEV, _IMPULSE, _IN_BAND_SINCE, _SETTLE_TIME = range(5)
+
+
+@njit(cache=True, fastmath=True)
+def _update(m, x, theta, force_abs_dt, ref_x, ref_theta, thresh_x, thresh_th, hold, t):
+    theta_err = wrap_angle(theta - ref_theta)
+    x_err = x - ref_x
+
+    m[_MAX_THETA] = max(m[_MAX_THETA], abs(theta_err))
+    m[_MAX_X_DEV] = max(m[_MAX_X_DEV], abs(x_err))
+    m[_IMPULSE] += force_abs_dt
+
+    in_band = (abs(x_err) <= thresh_x) and (abs(theta_err) <= thresh_th)
+
+    if m[_SETTLE_TIME] < 0.0:
+        if in_band:
+            if m[_IN_BAND_SINCE] < 0.0:
+                m[_IN_BAND_SINCE] = t
+            elif (t - m[_IN_BAND_SINCE]) >= hold:
+                m[_SETTLE_TIME] = m[_IN_BAND_SINCE]
+        else:
+            m[_IN_BAND_SINCE] = -1.0
 
 
-@dataclass
 class Metrics:
-    max_abs_theta: float = 0.0
-    max_abs_x_dev: float = 0.0
-    energy_abs_impulse: float = 0.0
-    settle_time: float | None = None
-    _in_band_since: float | None = None
+    """
+    Running performance metrics. State lives in a small array updated by a
+    Numba kernel; the attributes below are read-only views for the HUD.
+    """
 
-    def reset(self):
-        self.max_abs_theta = 0.0
-        self.max_abs_x_dev = 0.0
-        self.energy_abs_impulse = 0.0
-        self.settle_time = None
-        self._in_band_since = None
+    def __init__(self):
+        self._state = np.empty(5)
+        self.reset()
 
-    def update(self, state: np.ndarray, t: float, force: float, ref_x: float, ref_theta: float, dt: float):
-        x, _, theta, _ = state
+    @property
+    def max_abs_theta(self) -> float:
+        return float(self._state[_MAX_THETA])
 
-        theta_err = wrap_angle(theta - ref_theta)
-        x_err = x - ref_x
+    @property
+    def max_abs_x_dev(self) -> float:
+        return float(self._state[_MAX_X_DEV])
 
-        self.max_abs_theta = max(self.max_abs_theta, abs(theta_err))
-        self.max_abs_x_dev = max(self.max_abs_x_dev, abs(x_err))
-        self.energy_abs_impulse += abs(force) * dt
+    @property
+    def energy_abs_impulse(self) -> float:
+        return float(self._state[_IMPULSE])
 
-        in_band = (abs(x_err) <= P.settle_x_thresh) and (abs(theta_err) <= P.settle_theta_thresh)
+    @property
+    def settle_time(self) -> float | None:
+        st = self._state[_SETTLE_TIME]
+        return None if st < 0.0 else float(st)
 
-        if self.settle_time is None:
-            if in_band:
-                if self._in_band_since is None:
-                    self._in_band_since = t
-                elif (t - self._in_band_since) >= P.settle_hold_time:
-                    self.settle_time = self._in_band_since
-            else:
-                self._in_band_since = None
+    def reset(self):
+        self._state[:] = (0.0, 0.0, 0.0, -1.0, -1.0)
+
+    def update(self, state: np.ndarray, t: float, force: float, ref_x: float, ref_theta: float, dt: float):
+        """
+        Account for `dt` seconds under a constant `force`, ending at `state` at time `t`.
+        `dt` may span a whole frame of substeps: the impulse grows by |force| * dt, while
+        the peaks and the settle band are sampled at `state` only (peaks between
+        substeps are not seen).
+        """
+        _update(
+            self._state, float(state[0]), float(state[2]), abs(force) * dt, ref_x, ref_theta,
+            P.settle_x_thresh, P.settle_theta_thresh, P.settle_hold_time, t,
+        )
 
 
+def warmup_metrics():
+    """Compile (or load from cache) the metrics kernel on dummy data."""
+    Metrics().update(np.zeros(4), 0.0, 0.0, 0.0, 0.0, 0.0)
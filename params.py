@@ -18,9 +18,13 @@ class Params:
     max_force: float = 50.0
     max_mouse_force: float = 50.0
 
-    # Integration
+    # Integration (physics runs at substeps * display_fps = 1/dt Hz)
     dt: float = 1.0 / 240.0
-    substeps: int = 2
+    substeps: int = 4
+    integrator: str = "rk4"   # "rk4" or "semi_implicit" (cheaper, first-order)
+
+    # Display
+    display_fps: int = 60
 
     # Display scaling
     pixels_per_meter: float = 170.0
@@ -32,7 +36,7 @@ class Params:
     pole_thickness_px: int = 6
 
     # History/plots
-    history_len: int = 900
+    history_len: int = 450   # one sample per displayed frame (7.5 s at 60 fps)
     plot_enabled_default: bool = True
 
     # Settling thresholds
@@ -1,8 +1,19 @@
+import functools
+
 import numpy as np
 import pygame
 
 from utils import clamp
 
+# Number of fade steps (and polyline draw calls) for phase-plot trajectories
+PHASE_FADE_BUCKETS = 8
+
+
+@functools.lru_cache(maxsize=None)
+def _font(size: int) -> pygame.font.Font:
+    # SysFont scans the system font list, so build each size once on first use
+    return pygame.font.SysFont("consolas", size)
+
 
 def draw_plot(surface, rect: pygame.Rect, data, ymin, ymax, label: str, ref_value=None):
     pygame.draw.rect(surface, (255, 255, 255), rect, border_radius=8)
@@ -19,20 +30,17 @@ def draw_plot(surface, rect: pygame.Rect, data, ymin, ymax, label: str, ref_valu
         ry = clamp(ry, rect.y + 6, rect.bottom - 6)
         pygame.draw.line(surface, (170, 170, 170), (rect.x + 6, int(ry)), (rect.right - 6, int(ry)), 1)
 
+    data = np.asarray(data, dtype=float)
     xs = np.linspace(rect.x + 6, rect.right - 6, num=len(data))
-    ys = []
-    for v in data:
-        if ymax <= ymin:
-            y = midy
-        else:
-            y = rect.bottom - 6 - (v - ymin) / (ymax - ymin) * (rect.height - 12)
-        ys.append(y)
-
-    pts = list(zip(xs.astype(int), np.array(ys).astype(int)))
+    if ymax <= ymin:
+        ys = np.full(len(data), float(midy))
+    else:
+        ys = rect.bottom - 6 - np.clip((data - ymin) / (ymax - ymin), 0.0, 1.0) * (rect.height - 12)
+
+    pts = np.column_stack((xs, ys)).astype(np.int32).tolist()
     pygame.draw.lines(surface, (0, 0, 0), False, pts, 2)
 
-    font = pygame.font.SysFont("consolas", 14)
-    txt = font.render(label, True, (20, 20, 20))
+    txt = _font(14).render(label, True, (20, 20, 20))
     surface.blit(txt, (rect.x + 8, rect.y + 6))
 
 
@@ -64,15 +72,15 @@ def draw_phase_plot(
     plot_w = rect.width - 2 * pad
     plot_h = rect.height - 2 * pad
 
-    font = pygame.font.SysFont("consolas", 11)
-    value_font = pygame.font.SysFont("consolas", 10)
+    font = _font(11)
+    value_font = _font(10)
 
     def to_px(xv, yv):
         if xmax <= xmin or ymax <= ymin:
             return plot_x + plot_w // 2, plot_y + plot_h // 2
         px = plot_x + (xv - xmin) / (xmax - xmin) * plot_w
         py = plot_y + plot_h - (yv - ymin) / (ymax - ymin) * plot_h
-        return int(clamp(px, plot_x, plot_x + plot_w)), int(clamp(py, plot_y, plot_y + plot_h))
+        return int(min(max(px, plot_x), plot_x + plot_w)), int(min(max(py, plot_y), plot_y + plot_h))
 
     # Draw axes through origin
     origin_px, origin_py = to_px(0, 0)
@@ -103,19 +111,31 @@ def draw_phase_plot(
     if len(x_data) < 2 or len(y_data) < 2:
         return
 
-    # Build points
-    pts = []
-    for xv, yv in zip(x_data, y_data):
-        pts.append(to_px(xv, yv))
+    # Build points: one vectorized pass instead of a to_px call per sample
+    if xmax <= xmin or ymax <= ymin:
+        pts = [(plot_x + plot_w // 2, plot_y + plot_h // 2)] * len(x_data)
+    else:
+        x_arr = np.asarray(x_data, dtype=float)
+        y_arr = np.asarray(y_data, dtype=float)
+        px = plot_x + (x_arr - xmin) * (plot_w / (xmax - xmin))
+        py = plot_y + plot_h - (y_arr - ymin) * (plot_h / (ymax - ymin))
+        np.clip(px, plot_x, plot_x + plot_w, out=px)
+        np.clip(py, plot_y, plot_y + plot_h, out=py)
+        pts = np.column_stack((px, py)).astype(np.int32).tolist()
 
     # Draw trajectory
     if len(pts) >= 2:
-        # Draw with fading effect (older points lighter)
+        # Draw with fading effect (older points lighter), one polyline per fade bracket
         n = len(pts)
-        for i in range(n - 1):
-            alpha = 0.3 + 0.7 * (i / n)
-            c = tuple(int(255 - alpha * (255 - cc)) for cc in color)
-            pygame.draw.line(surface, c, pts[i], pts[i + 1], 2)
+        bounds = np.linspace(0, n - 1, PHASE_FADE_BUCKETS + 1).astype(int)
+        # Colour ramp sampled at each bucket start, mixed towards white
+        alphas = 0.3 + 0.7 * (bounds[:-1] / n)
+        ramp = (255 - alphas[:, None] * (255 - np.asarray(color, dtype=float))).astype(int).tolist()
+        for c, start, end in zip(ramp, bounds[:-1].tolist(), bounds[1:].tolist()):
+            if end <= start:
+                continue
+            # Slices share their end point so the curve stays connected
+            pygame.draw.lines(surface, c, False, pts[start:end + 1], 2)
 
     # Highlight current point
     if pts:
@@ -0,0 +1,25 @@
+"""
+Builds the optional C extension for the RK4 step:
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+The simulation runs without it (dynamics.py falls back to the Numba kernel).
+"""
+import sys
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+if sys.platform == "win32":
+    compile_args = ["/O2", "/fp:fast"]
+else:
+    compile_args = ["-O3", "-ffast-math", "-march=native"]
+
+setup(
+    name="cartpole-dynamics-ext",
+    ext_modules=cythonize(
+        [Extension("_dynamics", ["_dynamics.pyx"], extra_compile_args=compile_args)],
+        language_level=3,
+    ),
+)
@@ -6,12 +6,16 @@ import numpy as np
 from params import P
 
 
+PI = math.pi
+TWO_PI = 2.0 * math.pi
+
+
 def wrap_angle(theta: float) -> float:
-    return (theta + math.pi) % (2 * math.pi) - math.pi
+    return (theta + PI) % TWO_PI - PI
 
 
 def clamp(v: float, lo: float, hi: float) -> float:
-    return float(max(lo, min(hi, v)))
+    return max(lo, min(hi, v))
 
 
 def mechanical_energy(state: np.ndarray) -> float:
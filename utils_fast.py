@@ -0,0 +1,38 @@
+"""
+Numba helpers for use inside @njit kernels. wrap_angle mirrors utils.wrap_angle
+and inlines into the caller; from plain Python, prefer the utils.py version.
+"""
+import math
+
+import numpy as np
+from numba import njit
+
+PI = math.pi
+TWO_PI = 2.0 * math.pi
+
+
+@njit(cache=True, fastmath=True, inline='always')
+def wrap_angle(theta: float) -> float:
+    return (theta + PI) % TWO_PI - PI
+
+
+@njit(cache=True, fastmath=True)
+def hud_stats(state, ref_x, ref_theta, M, m, l, g):
+    """Return (mechanical energy, wrapped theta error, x error) in one pass."""
+    x, x_dot, theta, theta_dot = state[0], state[1], state[2], state[3]
+    s = math.sin(theta)
+    c = math.cos(theta)
+
+    x_com_dot = x_dot + l * theta_dot * c
+    y_com_dot = -l * theta_dot * s
+    v_com2 = x_com_dot * x_com_dot + y_com_dot * y_com_dot
+
+    T = 0.5 * M * x_dot * x_dot + 0.5 * m * v_com2 + 0.5 * ((1.0 / 3.0) * m * l * l) * theta_dot * theta_dot
+    V = m * g * l * (1.0 - c)  # 0 at upright
+
+    return T + V, wrap_angle(theta - ref_theta), x - ref_x
+
+
+def warmup_hud_stats():
+    """Compile (or load from cache) hud_stats on dummy data."""
+    hud_stats(np.zeros(4), 0.0, 0.0, 1.0, 1.0, 1.0, 1.0)